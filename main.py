@@ -2,23 +2,31 @@
 Main entry point for the Risk Analytics Dashboard
 """
 
+from functools import lru_cache
+
 import pandas as pd
-import yfinance as yf
+from src.utils.data_cache import cached_download
 from src.visualization.dashboard import RiskDashboard
 
+@lru_cache(maxsize=8)
+def download_prices(symbols: tuple, start: str, end: str) -> pd.DataFrame:
+    """Download adjusted close prices for all symbols in one batched request."""
+    data = cached_download(' '.join(symbols), start=start, end=end,
+                           group_by='ticker', progress=False, threads=True)
+    return pd.concat(
+        {symbol: data[symbol]['Adj Close'] if 'Adj Close' in data[symbol]
+         else data[symbol]['Close']
+         for symbol in symbols},
+        axis=1
+    )
+
 def main():
     # Example portfolio data
-    symbols = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META']
-    
-    # Download data
-    portfolio_data = pd.DataFrame()
-    for symbol in symbols:
-        data = yf.download(symbol, start='2020-01-01', end='2023-12-31')
-        if 'Adj Close' in data.columns:
-            portfolio_data[symbol] = data['Adj Close']
-        else:
-            portfolio_data[symbol] = data['Close']
-    
+    symbols = ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META')
+
+    # Download data in a single batched request
+    portfolio_data = download_prices(symbols, start='2020-01-01', end='2023-12-31')
+
     # Initialize and run dashboard
     dashboard = RiskDashboard(portfolio_data)
     dashboard.run()
@@ -0,0 +1,44 @@
+"""
+Market Data Cache
+
+Disk cache for yfinance downloads. Raw frames are stored as
+zstd-compressed Parquet under ``.cache/`` and reused until they expire,
+so repeated runs start from disk instead of the network.
+"""
+
+import re
+import time
+from pathlib import Path
+
+import pandas as pd
+import yfinance as yf
+
+CACHE_DIR = Path('.cache')
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+
+def cached_download(symbols: str, start, end, ttl: int = DEFAULT_TTL, **kwargs) -> pd.DataFrame:
+    """
+    Download market data via yfinance with a local Parquet cache.
+
+    Args:
+        symbols: Ticker symbol or space-separated list of symbols
+        start: Start date
+        end: End date
+        ttl: Cache lifetime in seconds (default: one day)
+        **kwargs: Extra arguments passed through to yf.download
+
+    Returns:
+        pd.DataFrame: Downloaded (or cached) market data
+    """
+    key = '_'.join(str(part) for part in (symbols, start, end))
+    key = re.sub(r'[^A-Za-z0-9._-]+', '-', key)
+    path = CACHE_DIR / f"{key}.parquet"
+
+    if path.exists() and time.time() - path.stat().st_mtime < ttl:
+        return pd.read_parquet(path)
+
+    data = yf.download(symbols, start=start, end=end, **kwargs)
+    if not data.empty:
+        CACHE_DIR.mkdir(exist_ok=True)
+        data.to_parquet(path, compression='zstd')
+    return data
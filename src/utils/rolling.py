@@ -0,0 +1,57 @@
+"""
+Rolling Window Kernels
+
+Cumulative-sum based rolling statistics that scan the data once in O(N),
+bypassing pandas' per-window dispatch. Output matches pandas'
+``rolling(window).mean()`` / ``rolling(window).std()`` shape: the first
+``window - 1`` entries are NaN.
+"""
+
+import numpy as np
+
+def _windowed_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each trailing window via a cumulative-sum difference."""
+    cumulative = np.cumsum(values, axis=0, dtype=np.float64)
+    sums = cumulative[window - 1:].copy()
+    sums[1:] -= cumulative[:-window]
+    return sums
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean over the leading axis in a single O(N) pass.
+
+    Args:
+        values: 1D or 2D array (observations along axis 0)
+        window: Window length in observations
+
+    Returns:
+        np.ndarray: Rolling mean, NaN for the first window - 1 entries
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    out[window - 1:] = _windowed_sums(values, window) / window
+    return out
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviation over the leading axis in a single O(N) pass.
+
+    Uses running sums of x and x^2 so each window costs O(1) instead of a
+    full per-window variance recomputation.
+
+    Args:
+        values: 1D or 2D array (observations along axis 0)
+        window: Window length in observations
+        ddof: Delta degrees of freedom (default 1, matching pandas)
+
+    Returns:
+        np.ndarray: Rolling std, NaN for the first window - 1 entries
+    """
+    values = np.asarray(values, dtype=np.float64)
+    sums = _windowed_sums(values, window)
+    sq_sums = _windowed_sums(values * values, window)
+    variance = (sq_sums - sums * sums / window) / (window - ddof)
+    np.clip(variance, 0, None, out=variance)
+    out = np.full(values.shape, np.nan)
+    out[window - 1:] = np.sqrt(variance)
+    return out